@@ -1,93 +1,114 @@
+import sys
 import unittest
-import re
-from typing import Tuple, Iterator
-from dataclasses import dataclass
-import datetime
+from typing import Tuple, Iterator, Iterable, NamedTuple
 from collections import defaultdict
 
+_MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_MONTH_IDS = {name: month for month, name in enumerate(_MONTH_NAMES)}
+# days, hours and minutes are at most two digits: a dict hit is cheaper than int()
+_D2 = {f"{i:02d}": i for i in range(100)} | {str(i): i for i in range(10)}
+# day accumulators are keyed by month * _DAY_KEY_STRIDE + day; wider than any day _D2 yields
+_DAY_KEY_STRIDE = 100
+
 def line_reader():
-    with open('time_parser_input_example.txt', 'r') as input_:
-        for line in input_:
-            yield line
+    # one read and one decode for the whole file instead of per-line TextIOWrapper work
+    with open('time_parser_input_example.txt', 'rb') as input_:
+        data = input_.read()
+    yield from data.decode('ascii').splitlines()
 
-@dataclass(frozen=True)
-class Date:
-    date: str
+class Date(NamedTuple):
+    month: int  # 0-based index into _MONTH_NAMES
+    day: int
 
 class Timedelta:
-    _data: datetime.timedelta
+    _h: int
+    _m: int
     def __init__(self, hours, minutes, extra_hours = None):
-        hours = hours
         if extra_hours:
             hours += 24
 
-        self._data =  datetime.timedelta(
-            hours=hours,
-            minutes=minutes,
-        )
+        self._h, self._m = divmod(hours * 60 + minutes, 60)
     
-    @classmethod
-    def get_null(cls):
-        return cls(hours=0, minutes=0)
-
     @property
     def hours(self):
-        return int(self._data.total_seconds() / 3600)
+        return self._h
 
     @property
     def minutes(self):
-        return int(self._data.total_seconds() / 60) - self.hours * 60
+        return self._m
 
-    def __add__(self, other):
-        self._data += other._data
-        return self
+    def __eq__(self, other):
+        if not isinstance(other, Timedelta):
+            return NotImplemented
+        return self._h == other._h and self._m == other._m
+
+    def __hash__(self):
+        return hash((self._h, self._m))
 
-@dataclass(frozen=True)
-class TimedeltaAtDate:
+class TimedeltaAtDate(NamedTuple):
     date: Date
-    timedelta: Timedelta
+    timedelta: Tuple[int, int]  # (hours, minutes), extra day already folded in
+
+def _parse_line(line) -> Tuple[int, int, int, int]:
+    # "Jul 2   (1+12:44)" -> "Jul", "2", "(1+12:44)" -> (6, 2, 36, 44)
+    # time is "(H:M)" with an optional "N+" prefix; H and M may be one or two digits
+    month, day, time = line.split()
+    colon = time.find(":")
+    plus = time.find("+")
+    if (time[:1] != "(" or time[-1:] != ")" or colon < 0
+            or (plus >= 0 and not 1 < plus < colon)):
+        raise ValueError(f"malformed time {time!r} in line {line!r}")
+
+    try:
+        hours = _D2[time[plus + 1 if plus >= 0 else 1:colon]]
+        if plus >= 0 and _D2[time[1:plus]]:
+            hours += 24
+
+        return _MONTH_IDS[month], _D2[day], hours, _D2[time[colon + 1:-1]]
+    except KeyError as error:
+        raise ValueError(f"malformed field {error.args[0]!r} in line {line!r}") from None
 
 class TimedeltaAtDateFactory:
-    def __new__(cls, line) -> TimedeltaAtDate:
-        regex_date = "([a-zA-Z]+\s+[0-9]+)"
-        regex_extra_thing = "(([0-9])\+)?"
-        regex_hours = "([0-9]+)"
-        regex_minutes = "([0-9]+)"
-
-        regex = f"^\s*{regex_date}\s+\({regex_extra_thing}{regex_hours}:{regex_minutes}\)$"
-        result = re.search(regex, line)
-
-        return TimedeltaAtDate(
-            date=Date(
-                date=result.group(1),
-            ),
-            timedelta=Timedelta(
-                hours=int(result.group(4)),
-                minutes=int(result.group(5)),
-                extra_hours=int(result.group(3)) if result.group(3) is not None else None,
-            ),
-        )
+    @staticmethod
+    def from_line(line) -> TimedeltaAtDate:
+        month, day, hours, minutes = _parse_line(line)
+        return TimedeltaAtDate(Date(month, day), (hours, minutes))
+
+    @staticmethod
+    def from_fields(month: str, day: int, extra_hours, hours: int, minutes: int) -> TimedeltaAtDate:
+        if extra_hours:
+            hours += 24
+        return TimedeltaAtDate(Date(_MONTH_IDS[month], day), (hours, minutes))
 
 class AggregatedTimeIntoDays:
     def __init__(self):
-        self._summed_timedelta = defaultdict(Timedelta.get_null)
+        # plain int accumulators keyed by month * _DAY_KEY_STRIDE + day, turned into
+        # Date/Timedelta only when iterated
+        self._summed_minutes = defaultdict(int)
 
     def __add__(self, other: TimedeltaAtDate):
-        self._summed_timedelta[other.date] += other.timedelta
+        hours, minutes = other.timedelta
+        self._summed_minutes[other.date.month * _DAY_KEY_STRIDE + other.date.day] += hours * 60 + minutes
+        return self
+
+    def add_lines(self, lines: Iterable[str]):
+        # parses straight into the accumulators, skipping the TimedeltaAtDate per line
+        summed_minutes = self._summed_minutes
+        for line in lines:
+            month, day, hours, minutes = _parse_line(line)
+            summed_minutes[month * _DAY_KEY_STRIDE + day] += hours * 60 + minutes
         return self
 
-    def __iter__(self) -> Iterator[Tuple[datetime.date, datetime.timedelta]]:
-        for date, time in self._summed_timedelta.items():
-            yield date, time
+    def __iter__(self) -> Iterator[Tuple[Date, Timedelta]]:
+        for key, minutes in self._summed_minutes.items():
+            yield Date(*divmod(key, _DAY_KEY_STRIDE)), Timedelta(*divmod(minutes, 60))
 
 class ActionAgregate:
     def __init__(self):
         self._aggregated_time_per_day = AggregatedTimeIntoDays()
 
     def run(self):
-        for line in line_reader():
-            parsed_datetime = TimedeltaAtDateFactory(line)
-            self._aggregated_time_per_day += parsed_datetime
+        self._aggregated_time_per_day.add_lines(line_reader())
         return self
 
     @property
@@ -95,8 +116,10 @@ class ActionAgregate:
         return self._aggregated_time_per_day
 
 def main():
-    for date, time in ActionAgregate().run().aggregated_time_per_day:
-        print(f"{date.date}: {time.hours}:{time.minutes}")
+    sys.stdout.write("".join(
+        f"{_MONTH_NAMES[date.month]} {date.day}: {time.hours}:{time.minutes}\n"
+        for date, time in ActionAgregate().run().aggregated_time_per_day
+    ))
 
 if __name__=="__main__":
     main()
@@ -105,38 +128,97 @@ if __name__=="__main__":
 
 class TestParser(unittest.TestCase):
 
-    def setUp(self) -> None:
-        Timedelta.__eq__ = lambda self, other: (self.hours, self.minutes) == (other.hours, other.minutes)
-
     def test_file_reading(self):
         self.assertTrue(len(list([line for line in line_reader()])) > 0)
     
     def test_parse_line(self):
-        parsed = TimedeltaAtDateFactory("Jul 2   (04:17)")
-        self.assertEqual(parsed, TimedeltaAtDate(Date(date='Jul 2'), Timedelta(hours=4, minutes=17)))
+        parsed = TimedeltaAtDateFactory.from_line("Jul 2   (04:17)")
+        self.assertEqual(parsed, TimedeltaAtDate(Date(month=6, day=2), (4, 17)))
 
     def test_parse_tricky_line(self):
-        parsed = TimedeltaAtDateFactory("Jul 2   (1+12:44)")
-        self.assertEqual(parsed, TimedeltaAtDate(Date(date='Jul 2'), Timedelta(hours=36, minutes=44)))
+        parsed = TimedeltaAtDateFactory.from_line("Jul 2   (1+12:44)")
+        self.assertEqual(parsed, TimedeltaAtDate(Date(month=6, day=2), (36, 44)))
+
+    def test_parse_unpadded_time(self):
+        self.assertEqual(TimedeltaAtDateFactory.from_line("Jul 2 (4:17)").timedelta, (4, 17))
+        self.assertEqual(TimedeltaAtDateFactory.from_line("Jul 2 (04:5)").timedelta, (4, 5))
+        self.assertEqual(TimedeltaAtDateFactory.from_line("Jul 2 (1+4:17)").timedelta, (28, 17))
+
+    def test_parse_malformed_time_raises(self):
+        for line in ["Jul 2 (12-34)", "Jul 2 [12:34]", "Jul 2 x12:34y", "Jul 2 (9912:34)",
+                     "Jul 2 (ab:cd)", "July 2 (12:34)", "Jul 123 (12:34)"]:
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    TimedeltaAtDateFactory.from_line(line)
+
+    def test_from_fields(self):
+        parsed = TimedeltaAtDateFactory.from_fields("Jul", 2, 1, 12, 44)
+        self.assertEqual(parsed, TimedeltaAtDateFactory.from_line("Jul 2   (1+12:44)"))
 
     def test_aggregator(self):
         aggregated_time_per_day = AggregatedTimeIntoDays()
-        aggregated_time_per_day += TimedeltaAtDateFactory("Jul 2   (22:50)")
-        aggregated_time_per_day += TimedeltaAtDateFactory("Jul 2   (22:50)")
+        aggregated_time_per_day += TimedeltaAtDateFactory.from_line("Jul 2   (22:50)")
+        aggregated_time_per_day += TimedeltaAtDateFactory.from_line("Jul 2   (22:50)")
+
+        self.assertEqual(next(iter(aggregated_time_per_day)), (Date(month=6, day=2), Timedelta(hours=45, minutes=40)))
+
+    def test_aggregator_from_lines(self):
+        aggregated_time_per_day = AggregatedTimeIntoDays()
+        aggregated_time_per_day.add_lines(["Jul 2   (22:50)", "Jul 2   (1+22:50)", "Jul 3   (00:05)"])
+
+        self.assertEqual(list(aggregated_time_per_day), [
+            (Date(month=6, day=2), Timedelta(hours=69, minutes=40)),
+            (Date(month=6, day=3), Timedelta(hours=0, minutes=5)),
+        ])
+
+    def test_aggregator_from_lines_matches_factory(self):
+        lines = list(line_reader())
+        aggregated_from_lines = AggregatedTimeIntoDays().add_lines(lines)
+        aggregated_from_factory = AggregatedTimeIntoDays()
+        for line in lines:
+            aggregated_from_factory += TimedeltaAtDateFactory.from_line(line)
+
+        self.assertEqual(list(aggregated_from_lines), list(aggregated_from_factory))
 
-        self.assertEqual(next(iter(aggregated_time_per_day)), (Date(date='Jul 2'), Timedelta(hours=45, minutes=40)))
+    def test_aggregator_from_malformed_lines_raises(self):
+        with self.assertRaises(ValueError):
+            AggregatedTimeIntoDays().add_lines(["Jul 2 (12-34)"])
+
+    def test_out_of_range_days_are_not_merged(self):
+        aggregated_time_per_day = AggregatedTimeIntoDays().add_lines(["Jan 32 (01:00)", "Feb 0 (01:00)"])
+
+        self.assertEqual(list(aggregated_time_per_day), [
+            (Date(month=0, day=32), Timedelta(hours=1, minutes=0)),
+            (Date(month=1, day=0), Timedelta(hours=1, minutes=0)),
+        ])
 
     def test_how_to_treat_extra_number(self):
         # like extra 24 hours?
         aggregated_time_per_day = AggregatedTimeIntoDays()
-        aggregated_time_per_day += TimedeltaAtDateFactory("Jul 2   (1+23:50)")
-        self.assertEqual(next(iter(aggregated_time_per_day)), (Date(date='Jul 2'), Timedelta(hours=47, minutes=50)))
+        aggregated_time_per_day += TimedeltaAtDateFactory.from_line("Jul 2   (1+23:50)")
+        self.assertEqual(next(iter(aggregated_time_per_day)), (Date(month=6, day=2), Timedelta(hours=47, minutes=50)))
+
+    def test_extra_number_is_a_flag_not_a_count(self):
+        # any non-zero extra adds one day, zero adds nothing
+        aggregated_time_per_day = AggregatedTimeIntoDays().add_lines(["Jul 2   (0+01:00)", "Jul 3   (2+01:00)"])
+
+        self.assertEqual(list(aggregated_time_per_day), [
+            (Date(month=6, day=2), Timedelta(hours=1, minutes=0)),
+            (Date(month=6, day=3), Timedelta(hours=25, minutes=0)),
+        ])
+
+    def test_timedelta_not_equal_to_other_types(self):
+        self.assertNotEqual(Timedelta(1, 0), None)
+        self.assertNotEqual((1, 0), Timedelta(1, 0))
+
+    def test_timedelta_is_hashable(self):
+        self.assertEqual(len({Timedelta(1, 0), Timedelta(0, 60), Timedelta(2, 0)}), 2)
 
     def test_hashable_date_appears_once_in_storage(self):
         storage = {}
 
-        storage[Date("Jul 2")] = 1
-        storage[Date("Jul 2")] = 2
+        storage[Date(6, 2)] = 1
+        storage[Date(6, 2)] = 2
 
         self.assertEqual(len(storage.keys()), 1)
 